@@ -1,34 +1,258 @@
 
 
+import os
+import time
+import hashlib
+import sqlite3
+import platform
+import functools
+import threading
+import importlib.util
+from concurrent.futures import ThreadPoolExecutor
 import keyring 
 import argparse
 import spotipy
 import subprocess
 import webbrowser
-import numpy as np
-from scipy.spatial import distance 
 
 
+# use every core this process may run on (affinity/cgroup aware) for the CPU encode;
+# env vars must be set before numpy and torch load their BLAS/OpenMP runtimes
+try:
+    CPU_THREADS = len(os.sched_getaffinity(0))
+except AttributeError:
+    CPU_THREADS = os.cpu_count() or 1
+os.environ.setdefault('OMP_NUM_THREADS', str(CPU_THREADS))
+os.environ.setdefault('MKL_NUM_THREADS', str(CPU_THREADS))
+
+import numpy as np
+import torch
+torch.set_num_threads(CPU_THREADS)
+torch.set_num_interop_threads(2)
+
 from sentence_transformers import SentenceTransformer
 
+try:
+    import simsimd
+except ImportError:
+    simsimd = None
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
 parser = argparse.ArgumentParser(description='Simple command line song utility')
 parser.add_argument("-p", type=str, help='The prompt to describe the playlist')
 parser.add_argument("-l", type=int, default=10, help='The length of the playlist')
 parser.add_argument("-n", type=str, default=argparse.SUPPRESS, help='The name of the playlist')
 parser.add_argument("-i", action='store_true', default=False, help='Build interactive or automatic playlist')
+parser.add_argument("-c", action='store_true', default=False, help='Run the NLP model on the CPU even if CUDA is available')
 args = parser.parse_args()
 if 'n' not in args:
     args.n = args.p
 
 separator = f'{100*"-"}'
 
+# distilled multilingual MiniLM; 'all-MiniLM-L6-v2' is smaller still but English-only
+NLP_MODEL_NAME = 'paraphrase-multilingual-MiniLM-L12-v2'
+EMBEDDING_CACHE_PATH = os.path.expanduser('~/.cache/spotify_pg/embeddings.sqlite')
+EMBEDDING_CACHE_SIZE = 100_000
+SQLITE_MAX_VARIABLES = 900
+SPOTIFY_ADD_ITEMS_LIMIT = 100
+ENCODE_BATCH_SIZE = 64
+SEARCH_LIMIT = 50
+SEARCH_PAGES = 5
+
+
+def default_device():
+    return 'cuda' if torch.cuda.is_available() else 'cpu'
+
+
+@functools.lru_cache(maxsize=None)
+def cpu_flags():
+    """
+    CPU feature flags from /proc/cpuinfo, else from py-cpuinfo when
+    installed (it spawns a subprocess, hence the cache). Empty if neither
+    is available.
+    """
+    try:
+        with open('/proc/cpuinfo') as f:
+            for line in f:
+                if line.startswith('flags'):
+                    return frozenset(line.split(':', 1)[1].split())
+    except OSError:
+        pass
+    try:
+        import cpuinfo
+        return frozenset(cpuinfo.get_cpu_info().get('flags', []))
+    except ImportError:
+        return frozenset()
+
+
+def onnx_model_file():
+    """
+    Picks the int8 ONNX export built for this CPU. The avx512_vnni build is
+    quantized without reduce_range and can saturate on CPUs without VNNI,
+    so every other x86 CPU gets the uint8 AVX2 build.
+    """
+    if platform.machine().lower() in ('arm64', 'aarch64'):
+        return 'onnx/model_qint8_arm64.onnx'
+    if cpu_flags() & {'avx512_vnni', 'avx512vnni'}:
+        return 'onnx/model_qint8_avx512_vnni.onnx'
+    return 'onnx/model_quint8_avx2.onnx'
+
+
+@functools.lru_cache(maxsize=None)
+def expected_model_variant(device):
+    """
+    The variant load_nlp_model will load for device unless the ONNX
+    export fails to load, known before the model is loaded so the
+    embedding cache can be used right away.
+    """
+    if device == 'cuda':
+        return 'cuda-fp16'
+    if not (importlib.util.find_spec('optimum') and importlib.util.find_spec('onnxruntime')):
+        return 'cpu-fp32'
+    return f'cpu-onnx-{onnx_model_file()}'
+
+
+def load_nlp_model(model_name, device):
+    """
+    Loads the sentence transformer in reduced precision: FP16 on CUDA,
+    otherwise the int8-quantized ONNX export for this CPU. Falls back to
+    FP32 if Optimum/ONNX Runtime are not installed or the ONNX export
+    cannot be loaded. Returns the model and a variant string naming the
+    backend and precision actually loaded.
+    """
+    if device == 'cuda':
+        return SentenceTransformer(model_name, device='cuda').half(), 'cuda-fp16'
+
+    if not (importlib.util.find_spec('optimum') and importlib.util.find_spec('onnxruntime')):
+        print("ONNX backend not installed. Using FP32 model.")
+        return SentenceTransformer(model_name, device='cpu'), 'cpu-fp32'
+
+    import onnxruntime
+    session_options = onnxruntime.SessionOptions()
+    session_options.intra_op_num_threads = CPU_THREADS
+
+    file_name = onnx_model_file()
+    try:
+        model = SentenceTransformer(
+            model_name,
+            device='cpu',
+            backend='onnx',
+            model_kwargs={'file_name': file_name, 'session_options': session_options}
+        )
+        return model, f'cpu-onnx-{file_name}'
+    except Exception as e:
+        print(f"Could not load quantized ONNX model {file_name} ({e}). Using FP32 model.")
+        return SentenceTransformer(model_name, device='cpu'), 'cpu-fp32'
+
+
+_nlp_models = {}
+_nlp_models_lock = threading.Lock()
+
+
+def get_nlp_model(model_name, device):
+    """
+    Returns the (model, variant) pair loaded once per process and device
+    and shared by every SpotifyPlaylist instance.
+    """
+    with _nlp_models_lock:
+        if (model_name, device) not in _nlp_models:
+            _nlp_models[(model_name, device)] = load_nlp_model(model_name, device)
+        return _nlp_models[(model_name, device)]
+
+
+def has_plain_mean_pooling(model):
+    """
+    True if model is exactly a transformer followed by mean pooling, with
+    no Dense/Normalize or other modules, which is what run_nlp_model
+    reimplements.
+    """
+    modules = list(model)
+    if (len(modules) != 2 or not hasattr(modules[0], 'auto_model') or
+            type(modules[1]).__name__ != 'Pooling'):
+        return False
+
+    config = modules[1].get_config_dict()
+    if 'pooling_mode' in config:
+        mode = config['pooling_mode']
+        return mode == 'mean' or (isinstance(mode, (list, tuple)) and list(mode) == ['mean'])
+    modes = [key for key, value in config.items() if key.startswith('pooling_mode_') and value]
+    return modes == ['pooling_mode_mean_tokens']
+
+
+def cosine_similarities(candidate_vectors, prompt_vector):
+    """
+    Cosine similarity of each candidate row to the prompt as float32,
+    using SimSIMD kernels (native float16) when installed and a float32
+    BLAS dot product on the (already normalized) vectors otherwise.
+    """
+    if simsimd is not None:
+        distances = simsimd.cdist(prompt_vector[None], candidate_vectors, metric='cosine')
+        return 1 - np.asarray(distances, dtype=np.float32)[0]
+    return candidate_vectors.astype(np.float32) @ prompt_vector.astype(np.float32)
+
+
+def top_k_indices(scores, k):
+    """
+    Indices of the k highest scores in descending order, selected with an
+    O(n) partition so only the k survivors get sorted.
+    """
+    k = min(k, len(scores))
+    if k <= 0:
+        return np.empty(0, dtype=np.intp)
+    top = np.argpartition(-scores, k - 1)[:k]
+    return top[np.argsort(-scores[top])]
+
+
+def _rank_candidates(candidate_vectors, prompt_vector, keep, k):
+    """
+    Dot-product scores of the candidates where keep is set; returns the
+    indices of the k best in descending order.
+    """
+    n, d = candidate_vectors.shape
+    sims = np.empty(n, dtype=np.float64)
+    for i in range(n):
+        if not keep[i]:
+            sims[i] = -np.inf
+            continue
+        acc = 0.0
+        for j in range(d):
+            acc += candidate_vectors[i, j] * prompt_vector[j]
+        sims[i] = acc
+
+    order = np.argsort(-sims)
+    count = 0
+    while count < min(k, n) and sims[order[count]] != -np.inf:
+        count += 1
+    return order[:count]
+
+
+# SimSIMD takes precedence when installed; the Numba kernel replaces the numpy fallback
+rank_candidates = numba.njit(cache=True)(_rank_candidates) if numba is not None and simsimd is None else None
+
+
+def warm_up_rank_candidates():
+    """
+    Compiles (or loads from numba's on-disk cache) the ranking kernel so
+    the first playlist does not pay for it.
+    """
+    if rank_candidates is not None:
+        rank_candidates(np.zeros((1, 1), dtype=np.float32), np.zeros(1, dtype=np.float32),
+                        np.ones(1, dtype=np.bool_), 1)
+
+
 class SpotifyPlaylist:
 
-    def __init__(self, prompt, length=10, name=None, interactive=False):
+    def __init__(self, prompt, length=10, name=None, interactive=False, device=None):
         self.prompt = prompt
         self.length = int(length)
         self.name = name if name is not None else prompt
         self.interactive = interactive
+        self.device = device if device is not None else default_device()
         self.generated_tracks = [] 
         self.playlist_tracks = set()
         self.artists_blacklist = set()
@@ -37,13 +261,32 @@ class SpotifyPlaylist:
         self.sp = None
         self.current_user = None
         self.playlist = None
+        self._devices = None
         
        
-        print("Loading deep learning NLP model (this may take a moment)...")
-        # self.nlp_model = SentenceTransformer('all-MiniLM-L6-v2')
-        self.nlp_model = SentenceTransformer('paraphrase-multilingual-mpnet-base-v2')
+        print(f"Loading deep learning NLP model on {self.device} in the background...")
+        self.nlp_model = None
+        self.model_variant = None
+        self._model_ready = threading.Event()
+        threading.Thread(target=self._load_nlp_model, daemon=True).start()
+
+        self._emb_cache = self.open_embedding_cache()
 
-        print("Model loaded.")
+    def _load_nlp_model(self):
+        try:
+            self.nlp_model, self.model_variant = get_nlp_model(NLP_MODEL_NAME, self.device)
+            print("Model loaded.")
+        finally:
+            self._model_ready.set()
+        # after the model is ready, so a cold JIT compile never delays it
+        warm_up_rank_candidates()
+
+    def wait_for_nlp_model(self):
+        if not self._model_ready.is_set():
+            print("Waiting for the NLP model to finish loading...")
+        self._model_ready.wait()
+        if self.nlp_model is None:
+            raise RuntimeError("The NLP model could not be loaded.")
 
     def __repr__(self):
        
@@ -77,65 +320,218 @@ class SpotifyPlaylist:
         return result
 
     
+    def open_embedding_cache(self):
+        """
+        Opens the on-disk cache of sentence embeddings keyed by
+        sha1(model name + variant + text). Vectors are stored as float16
+        bytes. The least recently used entries over EMBEDDING_CACHE_SIZE
+        are evicted here, once per session.
+        """
+        os.makedirs(os.path.dirname(EMBEDDING_CACHE_PATH), exist_ok=True)
+        # used from the encoder thread in generate_nlp_playlist, one thread at a time
+        cache = sqlite3.connect(EMBEDDING_CACHE_PATH, check_same_thread=False)
+        cache.execute(
+            'CREATE TABLE IF NOT EXISTS embeddings '
+            '(key TEXT PRIMARY KEY, vector BLOB NOT NULL, last_used REAL NOT NULL)'
+        )
+        cache.execute('CREATE INDEX IF NOT EXISTS embeddings_last_used ON embeddings (last_used)')
+
+        excess = cache.execute('SELECT COUNT(*) FROM embeddings').fetchone()[0] - EMBEDDING_CACHE_SIZE
+        if excess > 0:
+            cache.execute(
+                'DELETE FROM embeddings WHERE key IN '
+                '(SELECT key FROM embeddings ORDER BY last_used LIMIT ?)',
+                (excess,)
+            )
+        cache.commit()
+        return cache
+
+    def encode_texts(self, texts):
+        """
+        Returns normalized float16 embeddings for texts as an (N, d) array,
+        only running the NLP model on the ones missing from the embedding cache.
+        Waits for the model only if something is missing.
+        """
+        # before the model has loaded, key by the variant it is expected to load
+        variant = self.model_variant or expected_model_variant(self.device)
+        keys = [hashlib.sha1(f'{NLP_MODEL_NAME}\n{variant}\n{t}'.encode('utf-8')).hexdigest() for t in texts]
+        unique_keys = list(set(keys))
+        now = time.time()
+
+        cached = {}
+        for start in range(0, len(unique_keys), SQLITE_MAX_VARIABLES):
+            chunk = unique_keys[start:start + SQLITE_MAX_VARIABLES]
+            placeholders = ','.join('?' * len(chunk))
+            rows = self._emb_cache.execute(
+                f'SELECT key, vector FROM embeddings WHERE key IN ({placeholders})', chunk
+            )
+            for key, vector in rows:
+                cached[key] = np.frombuffer(vector, dtype=np.float16)
+
+        first_index = {}
+        for i, key in enumerate(keys):
+            if key not in cached:
+                first_index.setdefault(key, i)
+
+        if first_index:
+            self.wait_for_nlp_model()
+            if self.model_variant != variant:
+                # the ONNX export failed to load, so the keys looked up above belong to another variant
+                return self.encode_texts(texts)
+
+        hits = list(cached)
+        for start in range(0, len(hits), SQLITE_MAX_VARIABLES):
+            chunk = hits[start:start + SQLITE_MAX_VARIABLES]
+            placeholders = ','.join('?' * len(chunk))
+            self._emb_cache.execute(
+                f'UPDATE embeddings SET last_used = ? WHERE key IN ({placeholders})', [now] + chunk
+            )
+
+        # similar lengths share a batch so little compute goes to padding
+        missing = sorted(first_index.values(), key=lambda i: len(texts[i]))
+        if missing:
+            new_vectors = self.run_nlp_model([texts[i] for i in missing])
+            for i, vector in zip(missing, new_vectors):
+                cached[keys[i]] = vector.astype(np.float16)
+
+            self._emb_cache.executemany(
+                'INSERT OR REPLACE INTO embeddings (key, vector, last_used) VALUES (?, ?, ?)',
+                [(keys[i], cached[keys[i]].tobytes(), now) for i in missing]
+            )
+        self._emb_cache.commit()
+
+        return np.stack([cached[key] for key in keys])
+
+    def run_nlp_model(self, texts):
+        """
+        Embeds texts in order as L2-normalized vectors. Torch models made of
+        a transformer plus mean pooling are called directly under
+        inference_mode, skipping the per-call overhead of
+        SentenceTransformer.encode; anything else goes through encode.
+        """
+        if (getattr(self.nlp_model, 'backend', 'torch') != 'torch' or
+                not has_plain_mean_pooling(self.nlp_model)):
+            return self.nlp_model.encode(texts, batch_size=ENCODE_BATCH_SIZE, convert_to_tensor=False,
+                                         convert_to_numpy=True, normalize_embeddings=True)
+
+        auto_model = self.nlp_model[0].auto_model
+        vectors = []
+        for start in range(0, len(texts), ENCODE_BATCH_SIZE):
+            batch = self.nlp_model.tokenizer(
+                texts[start:start + ENCODE_BATCH_SIZE],
+                padding=True,
+                truncation=True,
+                max_length=self.nlp_model.max_seq_length,
+                return_tensors='pt'
+            )
+            if self.nlp_model.device.type == 'cuda':
+                batch = {k: v.pin_memory().to(self.nlp_model.device, non_blocking=True) for k, v in batch.items()}
+            with torch.inference_mode():
+                token_embeddings = auto_model(**batch).last_hidden_state
+                mask = batch['attention_mask'].unsqueeze(-1).to(token_embeddings.dtype)
+                embeddings = (token_embeddings * mask).sum(dim=1) / mask.sum(dim=1).clamp(min=1e-9)
+                embeddings = torch.nn.functional.normalize(embeddings.float(), dim=1)
+            vectors.append(embeddings.cpu().numpy())
+        return np.concatenate(vectors)
+
+    def search_clients(self, count):
+        """
+        One Spotify client per search thread, so no requests.Session is
+        shared between threads. They all use a token fetched (and refreshed
+        if needed) once here, keeping the OAuth refresh path single-threaded.
+        """
+        token = self.sp.auth_manager.get_access_token(as_dict=False)
+        return [spotipy.Spotify(auth=token) for _ in range(count)]
+
+    def search_candidates(self):
+        """
+        Fetches SEARCH_PAGES pages of results for the prompt in the user's
+        market concurrently and yields each page's tracks not seen before,
+        in page order, as soon as it and all earlier pages have arrived.
+        Tracks are deduplicated by (artist, name), since the same song can
+        come back under several ids; the copy Spotify ranked highest is
+        kept. Fails only if every page fails.
+        """
+        clients = self.search_clients(SEARCH_PAGES)
+        with ThreadPoolExecutor(max_workers=SEARCH_PAGES) as executor:
+            futures = [executor.submit(client.search, q=self.prompt, type='track', limit=SEARCH_LIMIT,
+                                       offset=page * SEARCH_LIMIT, market='from_token')
+                       for page, client in enumerate(clients)]
+
+            seen = set()
+            errors = []
+            for future in futures:
+                try:
+                    items = future.result()['tracks']['items']
+                except Exception as e:
+                    errors.append(e)
+                    continue
+
+                page = []
+                for track in items:
+                    if not track:
+                        continue
+                    song = (track['artists'][0]['name'], track['name'])
+                    if song not in seen:
+                        seen.add(song)
+                        page.append(track)
+                if page:
+                    yield page
+
+        if len(errors) == len(futures):
+            raise errors[0]
+
     def generate_nlp_playlist(self):
         """
         Generates a song list using an NLP model to find
         semantically similar tracks to the prompt.
         """
         print(f"Generating vector for prompt: '{self.prompt}'")
-        
-        
-        prompt_vector = self.nlp_model.encode(self.prompt, convert_to_tensor=False)
+        print("Getting candidate songs from Spotify search...")
+        candidates = []
+        meta = []
+        vector_futures = []
+        # one encoder thread embeds each page while the remaining searches (and the
+        # model load, if it is still running) are in flight
+        with ThreadPoolExecutor(max_workers=1) as encoder:
+            prompt_future = encoder.submit(self.encode_texts, [self.prompt])
+            try:
+                for page in self.search_candidates():
+                    page_meta = [(track['artists'][0]['name'], track['name']) for track in page]
+                    page_texts = [f"{artist} - {name}" for artist, name in page_meta]
+                    vector_futures.append(encoder.submit(self.encode_texts, page_texts))
+                    candidates.extend(page)
+                    meta.extend(page_meta)
+            except Exception as e:
+                print(f"Error searching Spotify: {e}")
+                return []
 
-       
-        print("Getting 50 candidate songs from Spotify search...")
-        try:
-            search_results = self.sp.search(q=self.prompt, type='track', limit=50)
-            candidates = search_results['tracks']['items']
             if not candidates:
                 print(f"Error: Could not find any tracks matching '{self.prompt}'. Try a different prompt.")
                 return []
-        except Exception as e:
-            print(f"Error searching Spotify: {e}")
-            return []
-
-        
-        candidate_texts = []
-        for track in candidates:
-           
-            text = f"{track['artists'][0]['name']} - {track['name']}"
-            candidate_texts.append(text)
 
-        
-        print("Analyzing all 50 candidates with the NLP model...")
-        candidate_vectors = self.nlp_model.encode(candidate_texts, convert_to_tensor=False)
+            print(f"Analyzing all {len(candidates)} candidates with the NLP model...")
+            try:
+                prompt_vector = prompt_future.result()[0]
+                candidate_vectors = np.concatenate([future.result() for future in vector_futures])
+            except RuntimeError as e:
+                print(f"Error: {e}")
+                return []
 
         
         print("Calculating semantic similarity...")
-        similarities = []
-        for i, (track, vector) in enumerate(zip(candidates, candidate_vectors)):
-           
-            sim = 1 - distance.cosine(prompt_vector, vector)
-            
-            
-            similarities.append((sim, track))
-            
-        
-        
-        similarities.sort(key=lambda x: x[0], reverse=True)
-        
-        final_tracks = []
-        for sim, track in similarities:
-            
-            if (track['name'] in self.songs_blacklist or 
-                track['artists'][0]['name'] in self.artists_blacklist):
-                continue
-            
-            final_tracks.append(track)
-            if len(final_tracks) >= self.length:
-                break 
-                
-        return final_tracks
+        keep = np.array([artist not in self.artists_blacklist and name not in self.songs_blacklist
+                         for artist, name in meta])
+
+        if rank_candidates is not None:
+            top = rank_candidates(candidate_vectors.astype(np.float32), prompt_vector.astype(np.float32),
+                                  keep, self.length)
+            return [candidates[i] for i in top]
+
+        sims = cosine_similarities(candidate_vectors, prompt_vector)
+        sims = np.where(keep, sims, -np.inf)
+
+        return [candidates[i] for i in top_k_indices(sims, self.length) if keep[i]]
 
 
     def login_to_spotify(self):
@@ -164,8 +560,11 @@ class SpotifyPlaylist:
        
         self.login_to_spotify()
 
-        all_playlists = self.sp.user_playlists(self.current_user['id'])
-        playlist_names = [p['name'].lower() for p in all_playlists['items']]
+        playlist_names = set()
+        results = self.sp.user_playlists(self.current_user['id'])
+        while results:
+            playlist_names.update(p['name'].lower() for p in results['items'])
+            results = self.sp.next(results) if results['next'] else None
         
         p_name = f'_{self.name}'
         playlist_name = p_name
@@ -198,9 +597,11 @@ class SpotifyPlaylist:
             print("No tracks to add. Exiting.")
             return
 
+        track_ids = [song['id'] for song in self.generated_tracks]
+        for start in range(0, len(track_ids), SPOTIFY_ADD_ITEMS_LIMIT):
+            self.sp.playlist_add_items(self.playlist['id'], track_ids[start:start + SPOTIFY_ADD_ITEMS_LIMIT])
+
         for song in self.generated_tracks:
-            track_id = song['id']
-            self.sp.user_playlist_add_tracks(self.current_user['id'], self.playlist['id'], [track_id])
             print(f"Added: {song['artists'][0]['name']} - {song['name']}")
             
             if not first_song:
@@ -210,10 +611,19 @@ class SpotifyPlaylist:
             webbrowser.open(self.playlist['uri'])
             self.play_song_in_spotify(first_song)
 
+    def get_devices(self, refresh=False):
+        """
+        Returns the user's Spotify devices, fetched once per session and
+        re-fetched on refresh or while no device is available yet.
+        """
+        if refresh or not self._devices:
+            self._devices = self.sp.devices().get('devices', [])
+        return self._devices
+
     def play_song_in_spotify(self, song, start_position=0):
        
         try:
-            devices = self.sp.devices().get('devices', [])
+            devices = self.get_devices()
             if not devices:
                 print("No active Spotify device found. Trying to open Spotify...")
                 try:
@@ -225,8 +635,17 @@ class SpotifyPlaylist:
                     print(f"Error opening Spotify: {e}. Opening in browser.")
                     webbrowser.open(self.playlist['uri'])
             else:
+                try:
+                    self.sp.transfer_playback(devices[0]['id'])
+                except spotipy.SpotifyException as e:
+                    if e.http_status != 404:
+                        raise
+                    print("Spotify device is gone. Refreshing device list...")
+                    devices = self.get_devices(refresh=True)
+                    if not devices:
+                        raise
+                    self.sp.transfer_playback(devices[0]['id'])
                 print(f"Playing on device: {devices[0]['name']}")
-                self.sp.transfer_playback(devices[0]['id'])
                 self.sp.start_playback(uris=[song['uri']], position_ms=start_position)
         except Exception as e:
             print(f"Error playing song: {e}")
@@ -266,12 +685,10 @@ class SpotifyPlaylist:
                 print(f'Ignore {song_name} | blacklisted')
                 continue
             
-            track = self.sp.track(song['id']) 
-                                
             if not first_song:
                 first_song = song
 
-            start_position = track['duration_ms'] / 2
+            start_position = song['duration_ms'] // 2
             self.play_song_in_spotify(song, start_position)
             
             print(f'{track_name}  ({track_id}/{len(self.generated_tracks)})')
@@ -283,7 +700,7 @@ class SpotifyPlaylist:
             while True:
                 match input('Your choice: '):
                     case '1':
-                        self.sp.user_playlist_add_tracks(self.current_user['id'], self.playlist['id'], [track['id']])
+                        self.sp.user_playlist_add_tracks(self.current_user['id'], self.playlist['id'], [song['id']])
                         self.playlist_tracks.add(track_name)
                         self.songs_in_playlist.add(song_name)
                         print(f'>> added to playlist ({len(self.playlist_tracks)} tracks)')
@@ -326,6 +743,7 @@ if __name__ == '__main__':
     length = args.l
     name = args.n
     interactive = args.i
+    device = 'cpu' if args.c else None
 
     print(separator)
     print(' SPOTIFY DEEP LEARNING PLAYLIST GENERATOR '.center(100, '-'))
@@ -336,6 +754,6 @@ if __name__ == '__main__':
         parser.print_help()
     else:
         print('Creating playlist. Please wait...')
-        playlist = SpotifyPlaylist(prompt, length, name, interactive)
+        playlist = SpotifyPlaylist(prompt, length, name, interactive, device)
         playlist.main()
         print(playlist)
\ No newline at end of file